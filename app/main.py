@@ -1,31 +1,249 @@
 import os
-from rich.console import Console
-from dotenv import load_dotenv
-from common.schema import get_schema
-from common.runner import run_benchmark
-
-
-load_dotenv()
-
-console = Console()
-benchmarks = ["data_table_analysis", "financial_entities", "insurance_claims", "pii_extraction"]
-
-sample_size = int(os.getenv("SAMPLE_SIZE", -1))
-use_local_api = True if os.getenv("LOCAL_OPENAI_BASE_URL") else False
-model = os.getenv("LOCAL_OPENAI_MODEL") if use_local_api else os.getenv("OPENAI_MODEL")
-temperature = float(os.getenv("TEMPERATURE"))
-max_workers = int(os.getenv("MAX_WORKERS"))
-
-for benchmark_name in benchmarks:
-    schema = get_schema(benchmark_name)
-    results = run_benchmark(
-        benchmark_name=benchmark_name,
-        schema=schema,
-        sample_size=sample_size,
-        use_local_api=use_local_api,
-        model=model,
-        temperature=temperature,
-        max_workers=max_workers
+import sys
+import json
+import argparse
+from typing import Any, Dict, List
+
+
+# Heavy modules (pandas, pyarrow, openai, pydantic, rich) are imported inside the
+# commands that need them so `list` and `--help` start quickly.
+BENCHMARKS = ["data_table_analysis", "financial_entities", "insurance_claims", "pii_extraction"]
+SUMMARY_KEYS = ["benchmark_name", "model", "sample_size", "success_number", "error_number", "aborted_number",
+                "overall_accuracy", "latency", "prefix_cache", "timestamp", "statistics"]
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+def _env_list(name: str) -> List[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+def _split(values: List[str]) -> List[str]:
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    use_local_api = bool(os.getenv("LOCAL_OPENAI_BASE_URL"))
+    parser.add_argument("-b", "--benchmark", action="append", choices=BENCHMARKS, dest="benchmarks",
+                        help="benchmark to run, repeatable (env: BENCHMARKS, default: all)")
+    parser.add_argument("-n", "--sample-size", type=int, default=_env_int("SAMPLE_SIZE", -1),
+                        help="samples per benchmark, -1 for all (env: SAMPLE_SIZE)")
+    parser.add_argument("-t", "--temperature", type=float, default=_env_float("TEMPERATURE", 0.0),
+                        help="sampling temperature (env: TEMPERATURE)")
+    parser.add_argument("-w", "--max-workers", type=int, default=_env_int("MAX_WORKERS", 5),
+                        help="concurrent requests (env: MAX_WORKERS)")
+    parser.add_argument("--local", action=argparse.BooleanOptionalAction, default=use_local_api,
+                        help="use the LOCAL_OPENAI_* endpoint (default: on when LOCAL_OPENAI_BASE_URL is set)")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=_env_bool("STREAM"),
+                        help="stream responses and abort runaway generations (env: STREAM)")
+    parser.add_argument("-o", "--output", help="write full results, including per-sample records, to a JSON file")
+    parser.add_argument("--warmup", type=int, default=_env_int("WARMUP", 1),
+                        help="warm-up requests per benchmark and model, excluded from statistics (env: WARMUP)")
+    parser.add_argument("--prefix-cache", action=argparse.BooleanOptionalAction, default=_env_bool("PREFIX_CACHE"),
+                        help="order and warm up requests so servers can reuse the cached prompt prefix "
+                             "(env: PREFIX_CACHE)")
+    parser.add_argument("--http2", action=argparse.BooleanOptionalAction, default=_env_bool("HTTP2"),
+                        help="use HTTP/2, needs httpx[http2] (env: HTTP2)")
+    parser.add_argument("--connect-timeout", type=float, default=None,
+                        help="seconds to open a connection (env: HTTP_CONNECT_TIMEOUT, default 5)")
+    parser.add_argument("--read-timeout", type=float, default=None,
+                        help="seconds to wait for response data (env: HTTP_READ_TIMEOUT, default 600)")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.main", description="Structured output benchmarks for LLMs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="list available benchmarks")
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks against one model")
+    add_run_arguments(run_parser)
+    run_parser.add_argument("-m", "--model", default=None,
+                            help="model name (env: LOCAL_OPENAI_MODEL or OPENAI_MODEL)")
+
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="compare models, endpoints, temperatures and prompts, loading each dataset once")
+    add_run_arguments(sweep_parser)
+    sweep_parser.add_argument("-m", "--model", action="append", dest="models", default=None,
+                              help="model name, repeatable or comma separated (env: SWEEP_MODELS)")
+    sweep_parser.add_argument("--temperatures", action="append", default=None,
+                              help="temperatures, repeatable or comma separated (env: SWEEP_TEMPERATURES)")
+    sweep_parser.add_argument("--endpoint", action="append", dest="endpoints", default=None, metavar="NAME=URL",
+                              help="OpenAI compatible base URL, repeatable (default: the --local/--no-local endpoint)")
+    sweep_parser.add_argument("--prompt-variant", action="append", dest="prompt_variants", default=None,
+                              metavar="NAME=PATH",
+                              help="system prompt file, repeatable; PATH 'default' keeps the benchmark prompt "
+                                   "and '{default}' inside a file is replaced by it")
+
+    rescore_parser = subparsers.add_parser("rescore", help="re-judge predictions saved with --output")
+    rescore_parser.add_argument("path", help="results JSON written by run or sweep")
+    rescore_parser.add_argument("-o", "--output", help="write rescored results to a JSON file")
+    return parser
+
+def default_model(local: bool) -> str:
+    return os.getenv("LOCAL_OPENAI_MODEL") if local else os.getenv("OPENAI_MODEL")
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    from rich.console import Console
+
+    console = Console()
+    for result in results:
+        for key in SUMMARY_KEYS:
+            console.print(f"[yellow]{key}[/yellow]", result.get(key))
+
+def write_results(results: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+
+def command_list(args: argparse.Namespace) -> None:
+    for benchmark_name in BENCHMARKS:
+        print(benchmark_name)
+
+def run_benchmarks(args: argparse.Namespace, model: str, temperature: float) -> List[Dict[str, Any]]:
+    from common.schema import get_schema
+    from common.runner import run_benchmark
+
+    results = []
+    for benchmark_name in args.benchmarks:
+        results.append(run_benchmark(
+            benchmark_name=benchmark_name,
+            schema=get_schema(benchmark_name),
+            sample_size=args.sample_size,
+            use_local_api=args.local,
+            model=model,
+            temperature=temperature,
+            max_workers=args.max_workers,
+            stream=args.stream,
+            warmup=args.warmup,
+            prefix_cache=args.prefix_cache
+            ))
+    return results
+
+def command_run(args: argparse.Namespace) -> None:
+    results = run_benchmarks(args, args.model or default_model(args.local), args.temperature)
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+
+def _parse_pairs(values: List[str], flag: str) -> Dict[str, str]:
+    pairs = {}
+    for value in values:
+        name, sep, item = value.partition("=")
+        if not sep:
+            raise SystemExit(f"{flag} expects NAME=VALUE, got '{value}'")
+        pairs[name] = item
+    return pairs
+
+def sweep_endpoints(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.endpoints:
+        api_key = os.getenv("LOCAL_OPENAI_API_KEY", "local-key")
+        return {name: (url, api_key) for name, url in _parse_pairs(args.endpoints, "--endpoint").items()}
+    if args.local:
+        return {"local": (os.getenv("LOCAL_OPENAI_BASE_URL", "http://localhost:8000/v1"),
+                          os.getenv("LOCAL_OPENAI_API_KEY", "local-key"))}
+    return {"openai": (None, None)}
+
+def sweep_prompt_variants(args: argparse.Namespace) -> Dict[str, Any]:
+    if not args.prompt_variants:
+        return {"default": None}
+    variants = {}
+    for name, path in _parse_pairs(args.prompt_variants, "--prompt-variant").items():
+        if path == "default":
+            variants[name] = None
+        else:
+            with open(path) as f:
+                variants[name] = f.read()
+    return variants
+
+def command_sweep(args: argparse.Namespace) -> None:
+    from rich.console import Console
+    from rich.table import Table
+    from common.sweep import build_configs, run_sweep, comparison_rows
+
+    models = _split(args.models) if args.models else _env_list("SWEEP_MODELS") or [default_model(args.local)]
+    temperatures = _split(args.temperatures) if args.temperatures else _env_list("SWEEP_TEMPERATURES")
+    temperatures = [float(t) for t in temperatures] or [args.temperature]
+    endpoints = sweep_endpoints(args)
+    prompt_variants = sweep_prompt_variants(args)
+
+    configs = build_configs(models, endpoints, temperatures, prompt_variants)
+    results = run_sweep(
+        benchmarks=args.benchmarks,
+        configs=configs,
+        endpoints=endpoints,
+        prompt_variants=prompt_variants,
+        sample_size=args.sample_size,
+        max_workers=args.max_workers,
+        stream=args.stream,
+        warmup=args.warmup,
+        prefix_cache=args.prefix_cache
+    )
+
+    rows = comparison_rows(results)
+    table = Table(title="Sweep")
+    for column in rows[0] if rows else []:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*[
+            "-" if value is None else f"{value:.2%}" if key in ("accuracy", "cache_hit_ratio")
+            else f"{value:.3f}s" if key.startswith("latency") else str(value)
+            for key, value in row.items()
+        ])
+    Console().print(table)
+    if args.output:
+        write_results(results, args.output)
+
+def command_rescore(args: argparse.Namespace) -> None:
+    from common.runner import rescore_results
+
+    with open(args.path) as f:
+        results = json.load(f)
+    results = [rescore_results(result) for result in results]
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+
+COMMANDS = {
+    "list": command_list,
+    "run": command_run,
+    "sweep": command_sweep,
+    "rescore": command_rescore,
+}
+
+def main(argv=None) -> int:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("run", "sweep") and args.benchmarks is None:
+        args.benchmarks = _env_list("BENCHMARKS") or BENCHMARKS
+        unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"Undefined benchmark in BENCHMARKS: {', '.join(unknown)}")
+    if args.command in ("run", "sweep"):
+        from common.transport import configure_transport
+
+        # One keep-alive pool per process, sized to the request concurrency
+        # unless HTTP_MAX_CONNECTIONS sets it explicitly
+        configure_transport(
+            max_connections=None if os.getenv("HTTP_MAX_CONNECTIONS") else args.max_workers,
+            http2=args.http2,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout
         )
-    for key in ["benchmark_name", "model", "sample_size", "success_number", "overall_accuracy", "timestamp", "statistics"]:
-        console.print(f"[yellow]{key}[/yellow]", results.get(key))
+    COMMANDS[args.command](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, Any, List
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SUITES = ["micro", "e2e", "e2e_stream", "e2e_sweep", "e2e_sweep_prefix", "startup"]
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"threshold": 1.3, "min_delta": 0.001, "results": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results: Dict[str, float], baseline: Dict[str, Any], check_ratios: bool = True) -> List[str]:
+    regressions = []
+    for name, elapsed in results.items():
+        limit = baseline.get("limits", {}).get(name)
+        if limit is not None and elapsed > limit:
+            regressions.append(f"{name}: {elapsed:.4f}s > limit {limit:.4f}s")
+        reference = baseline["results"].get(name)
+        if reference is None or not check_ratios:
+            continue
+        ratio = baseline.get("thresholds", {}).get(name, baseline["threshold"])
+        if elapsed > reference * ratio and elapsed - reference > baseline["min_delta"]:
+            regressions.append(f"{name}: {elapsed:.4f}s > {reference:.4f}s x {ratio}")
+    return regressions
+
+def run_suite(suite: str, scale: str) -> Dict[str, float]:
+    if suite == "micro":
+        from .micro import run_micro
+        return run_micro(scale)
+    if suite == "e2e":
+        from .e2e import run_e2e
+        return run_e2e(scale)
+    if suite == "e2e_stream":
+        from .e2e import run_e2e
+        return run_e2e(scale, stream=True)
+    if suite == "e2e_sweep":
+        from .e2e import run_e2e_sweep
+        return run_e2e_sweep(scale)
+    if suite == "e2e_sweep_prefix":
+        from .e2e import run_e2e_sweep
+        return run_e2e_sweep(scale, prefix_cache=True)
+    if suite == "startup":
+        from .startup import run_startup
+        return run_startup(scale)
+    raise ValueError(f"Undefined suite: {suite}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Offline performance benchmarks")
+    parser.add_argument("--suite", choices=SUITES + ["all"], default="all")
+    parser.add_argument("--scale", choices=["small", "medium", "large"], default="small")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the current timings as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for suite in SUITES if args.suite == "all" else [args.suite]:
+        results.update(run_suite(suite, args.scale))
+
+    baseline = load_baseline(args.baseline)
+    for name, elapsed in results.items():
+        reference = baseline["results"].get(name)
+        suffix = f"  (baseline {reference:.4f}s)" if reference is not None else ""
+        print(f"{name:<55} {elapsed:.4f}s{suffix}")
+
+    if args.update_baseline:
+        baseline["scale"] = args.scale
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    # Absolute limits hold at any scale, ratios only against timings of the same scale
+    same_scale = baseline.get("scale", args.scale) == args.scale
+    if not same_scale:
+        print(f"baseline was recorded at scale={baseline['scale']}, skip ratio check")
+    regressions = compare(results, baseline, check_ratios=same_scale)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from common.schema import get_schema
+from common.data_loader import DataLoader
+from common.openai_client import OpenAIClient
+from common.runner import BenchmarkRunner
+from common.sweep import build_configs, sweep_tasks
+from common.transport import configure_transport, get_http_client
+from .generators import BENCHMARKS, generate_pairs, generate_tasks
+from .stub_server import StubServer
+
+
+E2E_SCALES = {
+    "small": {"num_samples": 20, "size": 4, "repeat": 3},
+    "medium": {"num_samples": 100, "size": 8, "repeat": 3},
+    "large": {"num_samples": 500, "size": 16, "repeat": 3},
+}
+
+
+def _run_e2e_once(benchmark_name: str, tasks, ground_truths, responses: Dict[str, str],
+                  latency: float, stream: bool) -> float:
+    with StubServer(responses, latency=latency) as server:
+        client = OpenAIClient(api_key="stub-key", base_url=server.base_url, model="stub",
+                              http_client=get_http_client())
+        runner = BenchmarkRunner(benchmark_name, get_schema(benchmark_name), openai_client=client)
+        start = time.perf_counter()
+        runner.evaluate(
+            tasks=tasks,
+            ground_truths=ground_truths,
+            system_prompt=DataLoader.get_default_prompt_template(benchmark_name),
+            stream=stream,
+        )
+        return time.perf_counter() - start
+
+def run_e2e(scale: str = "small", latency: float = 0.0, stream: bool = False) -> Dict[str, float]:
+    config = E2E_SCALES[scale]
+    results = {}
+    for benchmark_name in BENCHMARKS:
+        tasks = generate_tasks(benchmark_name, config["num_samples"])
+        ground_truths, predictions = generate_pairs(benchmark_name, config["num_samples"], config["size"])
+        responses = {task: json.dumps(fit) for task, fit in zip(tasks, predictions)}
+        # Fresh stub per run, fastest run counts, like micro and startup
+        results[f"{'e2e_stream' if stream else 'e2e'}[{benchmark_name}]"] = min(
+            _run_e2e_once(benchmark_name, tasks, ground_truths, responses, latency, stream)
+            for _ in range(config["repeat"])
+        )
+    return results
+
+def _run_e2e_sweep_once(benchmark_name: str, tasks, ground_truths, responses: Dict[str, str],
+                        latency: float, max_workers: int, prefix_cache: bool) -> float:
+    with StubServer(responses, latency=latency) as first, StubServer(responses, latency=latency) as second:
+        clients = {
+            "first": OpenAIClient(api_key="stub-key", base_url=first.base_url, model="stub",
+                                  http_client=get_http_client()),
+            "second": OpenAIClient(api_key="stub-key", base_url=second.base_url, model="stub",
+                                   http_client=get_http_client()),
+        }
+        prompt_variants = {"default": None, "terse": "{default}Answer with JSON only.\n"}
+        configs = build_configs(["stub-a", "stub-b"], clients, [0.0], prompt_variants)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            sweep_tasks(
+                pool, benchmark_name, tasks, ground_truths,
+                DataLoader.get_default_prompt_template(benchmark_name),
+                configs, clients, prompt_variants, prefix_cache=prefix_cache
+            )
+        return time.perf_counter() - start
+
+def run_e2e_sweep(scale: str = "small", latency: float = 0.01, max_workers: int = 8,
+                  prefix_cache: bool = False) -> Dict[str, float]:
+    # Size the shared pool to the workers, as the CLI does
+    configure_transport(max_connections=max_workers)
+    config = E2E_SCALES[scale]
+    results = {}
+    for benchmark_name in BENCHMARKS:
+        tasks = generate_tasks(benchmark_name, config["num_samples"])
+        ground_truths, predictions = generate_pairs(benchmark_name, config["num_samples"], config["size"])
+        responses = {task: json.dumps(fit) for task, fit in zip(tasks, predictions)}
+        results[f"{'e2e_sweep_prefix' if prefix_cache else 'e2e_sweep'}[{benchmark_name}]"] = min(
+            _run_e2e_sweep_once(benchmark_name, tasks, ground_truths, responses, latency, max_workers, prefix_cache)
+            for _ in range(config["repeat"])
+        )
+    return results
@@ -0,0 +1,174 @@
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+from common.schema import PII
+
+
+BENCHMARKS = ["data_table_analysis", "financial_entities", "insurance_claims", "pii_extraction"]
+
+ENTITY_CATEGORIES = ["Company", "Date", "Location", "Money", "Person", "Product", "Quantity"]
+CHANNELS = ["Email", "Phone", "Portal", "In-Person"]
+COVERAGE_TYPES = ["Property", "Auto", "Liability", "Health", "Travel", "Other"]
+OBJECT_TYPES = ["Vehicle", "Building", "Person", "Other"]
+INCIDENT_TYPES = ["rear_end_collision", "side_impact_collision", "house_fire", "burst_pipe_flood", "theft_burglary"]
+LOCATION_TYPES = ["intersection", "highway", "parking_lot", "residence_interior", "commercial_property"]
+
+
+def _word(rng: random.Random, length: int = 8) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length))
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(2015, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+def _nest(value: Any, depth: int) -> Any:
+    # Wrap a value in depth - 1 struct levels; depth 1 keeps the schema shape
+    for _ in range(depth - 1):
+        value = {"detail": value}
+    return value
+
+def data_table_analysis_truth(rng: random.Random, size: int, depth: int = 1) -> Dict[str, Any]:
+    columns = [f"col_{i}" for i in range(size)]
+    column_types = {col: rng.choice(["str", "int", "float"]) for col in columns}
+    column_max = {col: None if t == "str" else rng.randint(100, 1000) for col, t in column_types.items()}
+    column_min = {col: None if t == "str" else rng.randint(0, 99) for col, t in column_types.items()}
+    return {
+        "num_rows": rng.randint(1, 500),
+        "num_columns": size,
+        "column_types": {col: _nest(value, depth) for col, value in column_types.items()},
+        "column_max": {col: _nest(value, depth) for col, value in column_max.items()},
+        "column_min": {col: _nest(value, depth) for col, value in column_min.items()},
+        "identifier_first": _word(rng),
+        "identifier_last": _word(rng),
+        "identifier_shortest": _word(rng, 4),
+    }
+
+def financial_entities_truth(rng: random.Random, size: int, depth: int = 1) -> Dict[str, Any]:
+    # list_flatten joins the categories on the row index, so the flattened size is
+    # the product of the list lengths; spread `size` entities over the categories
+    counts = {category: 0 for category in ENTITY_CATEGORIES}
+    for _ in range(size):
+        counts[rng.choice(ENTITY_CATEGORIES)] += 1
+    return {
+        category: [_word(rng) for _ in range(count)] if count > 0 else None
+        for category, count in counts.items()
+    }
+
+def financial_entities_dense_truth(rng: random.Random, size: int) -> Dict[str, Any]:
+    # Worst case for list_flatten: `size` entities in every category, size ** 7 rows
+    return {category: [_word(rng) for _ in range(size)] for category in ENTITY_CATEGORIES}
+
+def insurance_claims_truth(rng: random.Random, size: int, depth: int = 1) -> Dict[str, Any]:
+    return {
+        "header": {
+            "claim_id": f"CLM-{rng.randint(0, 999999):06d}",
+            "report_date": _date(rng),
+            "incident_date": _date(rng),
+            "reported_by": f"{_word(rng)} {_word(rng)}",
+            "channel": rng.choice(CHANNELS),
+        },
+        "policy_details": {
+            "policy_number": f"POL-{rng.randint(0, 999999999):09d}",
+            "policyholder_name": f"{_word(rng)} {_word(rng)}",
+            "coverage_type": rng.choice(COVERAGE_TYPES),
+            "effective_date": _date(rng),
+            "expiration_date": _date(rng),
+        },
+        "insured_objects": [
+            {
+                "object_id": f"OBJ-{rng.randint(0, 999999):06d}",
+                "object_type": rng.choice(OBJECT_TYPES),
+                "make_model": _word(rng),
+                "year": rng.randint(1980, 2024),
+                "location_address": f"{rng.randint(1, 9999)} {_word(rng)} St",
+                "estimated_value": rng.randint(1000, 500000),
+            }
+            for _ in range(size)
+        ],
+        "incident_description": {
+            "incident_type": rng.choice(INCIDENT_TYPES),
+            "location_type": rng.choice(LOCATION_TYPES),
+            "estimated_damage_amount": rng.randint(100, 100000),
+            "police_report_number": None,
+        },
+    }
+
+def pii_extraction_truth(rng: random.Random, size: int, depth: int = 1) -> Dict[str, Any]:
+    fields = list(PII.model_fields)
+    filled = set(rng.sample(fields, min(size, len(fields))))
+    return {field: _word(rng) if field in filled else None for field in fields}
+
+TRUTH_GENERATORS = {
+    "data_table_analysis": data_table_analysis_truth,
+    "financial_entities": financial_entities_truth,
+    "insurance_claims": insurance_claims_truth,
+    "pii_extraction": pii_extraction_truth,
+}
+
+ENUM_FIELDS = {
+    "channel": CHANNELS,
+    "coverage_type": COVERAGE_TYPES,
+    "object_type": OBJECT_TYPES,
+    "incident_type": INCIDENT_TYPES,
+    "location_type": LOCATION_TYPES,
+    "column_types": ["str", "int", "float"],
+}
+
+def _perturb_value(rng: random.Random, value: Any, field: Optional[str]) -> Any:
+    # Keep perturbed values valid against the schema so predictions still parse
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return value + 1
+    if isinstance(value, float):
+        return value * 1.5
+    if isinstance(value, str):
+        if field in ENUM_FIELDS:
+            return rng.choice(ENUM_FIELDS[field])
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            return _date(rng)
+        return value + "x"
+    return value
+
+def perturb(rng: random.Random, value: Any, noise: float, field: Optional[str] = None) -> Any:
+    if isinstance(value, dict):
+        # values of a map such as column_types share the enum of their parent field
+        child = field if field in ENUM_FIELDS else None
+        return {key: perturb(rng, item, noise, child or key) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [perturb(rng, item, noise, field) for item in value]
+        if len(items) > 1 and rng.random() < noise:
+            rng.shuffle(items)
+        return items
+    if rng.random() < noise:
+        return _perturb_value(rng, value, field)
+    return value
+
+def generate_pairs(benchmark_name: str,
+                   num_samples: int,
+                   size: int,
+                   noise: float = 0.1,
+                   seed: int = 64,
+                   depth: int = 1) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build (ground_truths, predictions) for a benchmark.
+
+    ``size`` scales the nested part of each schema: number of table columns,
+    extracted entities, insured objects per claim or filled PII fields.
+    ``depth`` nests the per-column values of data_table_analysis in extra
+    struct levels. Depths above 1 no longer validate against the schema and
+    are only meant for the judge micro benchmark. The other generators ignore
+    it: insurance_claims_flat joins its flattened columns and Arrow cannot
+    join struct fields, so deeper claims fail in the code under test.
+    """
+    if benchmark_name not in TRUTH_GENERATORS:
+        raise ValueError(f"Undefined benchmark: {benchmark_name}")
+    rng = random.Random(seed)
+    ground_truths = [TRUTH_GENERATORS[benchmark_name](rng, size, depth) for _ in range(num_samples)]
+    predictions = [perturb(rng, truth, noise) for truth in ground_truths]
+    return ground_truths, predictions
+
+def generate_dense_entities(num_samples: int, size: int, seed: int = 64) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [financial_entities_dense_truth(rng, size) for _ in range(num_samples)]
+
+def generate_tasks(benchmark_name: str, num_samples: int) -> List[str]:
+    return [f"{benchmark_name} synthetic task #{i}" for i in range(num_samples)]
@@ -0,0 +1,88 @@
+import time
+import pyarrow as pa
+from typing import Callable, Dict, Any, List
+
+from common.evaluator import StructuredEvaluator, judge, judge_function, judge_inputs
+from common.data_loader import (
+    FLAT_TRANSFORMS,
+    list_flatten,
+    safe_join_type,
+    financial_entities_flat,
+    insurance_claims_flat,
+)
+from .generators import BENCHMARKS, generate_pairs, generate_dense_entities
+
+
+# dense_sizes put that many entities in every financial_entities category, the
+# worst case of list_flatten (size ** 7 rows per sample); depths nest the
+# data_table_analysis columns
+SCALES = {
+    "small": {"num_samples": 20, "sizes": [2, 4], "dense_sizes": [3], "depths": [4], "repeat": 3},
+    "medium": {"num_samples": 100, "sizes": [2, 4, 8], "dense_sizes": [3, 4], "depths": [4, 8], "repeat": 5},
+    "large": {"num_samples": 500, "sizes": [2, 4, 8, 12], "dense_sizes": [3, 4], "depths": [4, 8, 16], "repeat": 5},
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def _judge_all(benchmark_name: str, ground_truths: List[Dict], predictions: List[Dict]) -> None:
+    flat_transform = FLAT_TRANSFORMS.get(benchmark_name)
+    for truth, fit in zip(ground_truths, predictions):
+        judge(true_dict=truth, fit_dict=fit, flat_transform=flat_transform)
+
+def _judge_function_inputs(ground_truths: List[Dict], predictions: List[Dict]):
+    return [judge_inputs(truth, fit, financial_entities_flat) for truth, fit in zip(ground_truths, predictions)]
+
+def _list_table(ground_truths: List[Dict]) -> pa.Table:
+    df = pa.Table.from_pylist(ground_truths)
+    return df.select([x.name for x in df.schema if isinstance(x.type, pa.ListType)])
+
+def run_micro(scale: str = "small") -> Dict[str, float]:
+    config = SCALES[scale]
+    num_samples, repeat = config["num_samples"], config["repeat"]
+    evaluator = StructuredEvaluator()
+    results = {}
+
+    for size in config["sizes"]:
+        for benchmark_name in BENCHMARKS:
+            ground_truths, predictions = generate_pairs(benchmark_name, num_samples, size)
+            results[f"judge[{benchmark_name},size={size}]"] = measure(
+                lambda: _judge_all(benchmark_name, ground_truths, predictions), repeat)
+            results[f"evaluator[{benchmark_name},size={size}]"] = measure(
+                lambda: evaluator.evaluate_response_accuracy_with_breakdown(predictions, ground_truths), repeat)
+
+        ground_truths, predictions = generate_pairs("financial_entities", num_samples, size)
+        judge_inputs = _judge_function_inputs(ground_truths, predictions)
+        results[f"judge_function[size={size}]"] = measure(
+            lambda: [judge_function(true_one, fits) for true_tables, fits in judge_inputs for true_one in true_tables],
+            repeat)
+        list_table = _list_table(ground_truths)
+        results[f"list_flatten[size={size}]"] = measure(lambda: list_flatten(list_table), repeat)
+        null_table = pa.table({f"col_{i}": pa.nulls(num_samples) for i in range(size)})
+        results[f"safe_join_type[size={size}]"] = measure(lambda: safe_join_type(null_table), repeat)
+        results[f"financial_entities_flat[size={size}]"] = measure(
+            lambda: [financial_entities_flat([truth]) for truth in ground_truths], repeat)
+
+        ground_truths, _ = generate_pairs("insurance_claims", num_samples, size)
+        results[f"insurance_claims_flat[size={size}]"] = measure(
+            lambda: [insurance_claims_flat([truth]) for truth in ground_truths], repeat)
+
+    for size in config["dense_sizes"]:
+        ground_truths = generate_dense_entities(num_samples, size)
+        list_table = _list_table(ground_truths)
+        results[f"list_flatten[dense,size={size}]"] = measure(lambda: list_flatten(list_table), repeat)
+        results[f"financial_entities_flat[dense,size={size}]"] = measure(
+            lambda: [financial_entities_flat([truth]) for truth in ground_truths], repeat)
+
+    for depth in config["depths"]:
+        ground_truths, predictions = generate_pairs("data_table_analysis", num_samples, config["sizes"][-1], depth=depth)
+        results[f"judge[data_table_analysis,depth={depth}]"] = measure(
+            lambda: _judge_all("data_table_analysis", ground_truths, predictions), repeat)
+
+    return results
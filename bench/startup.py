@@ -0,0 +1,27 @@
+import sys
+import time
+import subprocess
+from pathlib import Path
+from typing import Dict
+
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEAT = {"small": 3, "medium": 5, "large": 5}
+COMMANDS = {
+    "startup[list]": ["list"],
+    "startup[--help]": ["--help"],
+    "startup[run --help]": ["run", "--help"],
+}
+
+
+def measure_startup(args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "app.main", *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_startup(scale: str = "small") -> Dict[str, float]:
+    return {name: measure_startup(args, REPEAT[scale]) for name, args in COMMANDS.items()}
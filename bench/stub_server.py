@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _usage(self, request: Dict, content: str) -> Dict:
+        # Emulate a server-side prefix cache: the system prompt counts as cached
+        # once the same (model, system prompt) pair has been served before
+        messages = request.get("messages", [])
+        system_prompt = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        key = (request.get("model"), system_prompt, json.dumps(request.get("response_format"), sort_keys=True))
+        with self.server.lock:
+            cached = key in self.server.prefixes
+            self.server.prefixes.add(key)
+        prompt_tokens = len(json.dumps(messages)) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+            "prompt_tokens_details": {"cached_tokens": len(system_prompt) // 4 if cached else 0},
+        }
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, request: Dict, content: str, chunk_chars: int = 4) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        max_tokens = request.get("max_tokens")
+        pieces = [content[i:i + chunk_chars] for i in range(0, len(content), chunk_chars)]
+        finish_reason = "stop"
+        if max_tokens is not None and len(pieces) > max_tokens:
+            pieces, finish_reason = pieces[:max_tokens], "length"
+        deltas = [{"role": "assistant", "content": ""}] + [{"content": piece} for piece in pieces]
+        try:
+            for i, delta in enumerate(deltas + [{}]):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "delta": delta,
+                        "finish_reason": finish_reason if i == len(deltas) else None,
+                        "logprobs": None,
+                    }],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            if request.get("stream_options", {}).get("include_usage"):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [],
+                    "usage": self._usage(request, "".join(pieces)),
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        task = next((m["content"] for m in request.get("messages", []) if m.get("role") == "user"), "")
+        content = self.server.responses.get(task, "{}")
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+
+        if request.get("stream"):
+            self._send_stream(request, content)
+            return
+
+        self._send_json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": self._usage(request, content),
+        })
+
+
+class StubServer:
+    """OpenAI-compatible chat completions endpoint answering from a fixed task -> content map."""
+
+    def __init__(self, responses: Dict[str, str], latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.responses = responses
+        self.httpd.latency = latency
+        self.httpd.connections = 0
+        self.httpd.prefixes = set()
+        self.httpd.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def connections(self) -> int:
+        return self.httpd.connections
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "StubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
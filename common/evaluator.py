@@ -17,7 +17,7 @@ def judge_function(true_one: pa.Table, fits: pa.Table) -> pa.Table:
     del mapper, mapper_id
     return result
 
-def judge(true_dict: dict, fit_dict: dict, flat_transform: Any=None) -> pa.Table:
+def judge_inputs(true_dict: dict, fit_dict: dict, flat_transform: Any=None) -> Tuple[List[pa.Table], pa.Table]:
     if flat_transform is not None:
         fits = flat_transform([fit_dict]).to_pylist()
         true_list = flat_transform([true_dict]).to_pylist()
@@ -46,6 +46,10 @@ def judge(true_dict: dict, fit_dict: dict, flat_transform: Any=None) -> pa.Table
         )
         for item in true_list
         ]
+    return true_list, fits
+
+def judge(true_dict: dict, fit_dict: dict, flat_transform: Any=None) -> pa.Table:
+    true_list, fits = judge_inputs(true_dict, fit_dict, flat_transform)
     fit_judge_function = partial(judge_function, fits=fits)
     judge_df = pa.concat_tables(list(map(fit_judge_function, true_list)))
     del fits, true_list, fit_judge_function
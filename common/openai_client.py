@@ -1,16 +1,33 @@
 import os
-from typing import Any, Optional, Tuple
+import time
+from typing import Any, Dict, Optional, Tuple
 import openai
+import pydantic
 from dotenv import load_dotenv
 
+from .streaming import SchemaGuard
+from .transport import get_http_client, request_timeout
+
 
 load_dotenv()
 
+def usage_of(usage: Any) -> Optional[Dict[str, int]]:
+    # cached_tokens is reported by OpenAI, and by vLLM with --enable-prompt-tokens-details
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details is not None else 0,
+    }
+
 class OpenAIClient:
     def __init__(self, 
                  api_key: Optional[str] = None,
                  base_url: Optional[str] = None,
-                 model: str = "gpt-4"):
+                 model: str = "gpt-4",
+                 http_client: Optional[Any] = None,
+                 timeout: Optional[Any] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4")
@@ -19,6 +36,10 @@ class OpenAIClient:
             client_kwargs["api_key"] = self.api_key
         if self.base_url:
             client_kwargs["base_url"] = self.base_url
+        if http_client is not None:
+            client_kwargs["http_client"] = http_client
+        if timeout is not None:
+            client_kwargs["timeout"] = timeout
             
         self.client = openai.OpenAI(**client_kwargs)
     
@@ -47,7 +68,87 @@ class OpenAIClient:
             
         except Exception as e:
             return {"error": f"{e}"}, False
-    
+
+    def get_streaming_response(self,
+                               task: str,
+                               system_prompt: str,
+                               response_format: Any,
+                               model: Optional[str] = None,
+                               temperature: float = 0.0,
+                               max_tokens: Optional[int] = None,
+                               json_schema: Optional[Dict[str, Any]] = None,
+                               check_interval: int = 8) -> Tuple[Dict[str, Any], bool]:
+        model_name = model or self.model
+        guard = SchemaGuard(json_schema) if json_schema is not None else None
+        content = []
+        ttft = None
+        usage = None
+        finish_reason = None
+        start = time.perf_counter()
+
+        def aborted(reason: str) -> Tuple[Dict[str, Any], bool]:
+            return {"error": reason, "aborted": True, "ttft": ttft, "num_tokens": len(content)}, False
+
+        try:
+            with self.client.chat.completions.stream(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": task}
+                ],
+                response_format=response_format,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream_options={"include_usage": True}
+            ) as stream:
+                for event in stream:
+                    if event.type == "chunk":
+                        if event.chunk.usage is not None:
+                            usage = usage_of(event.chunk.usage)
+                        for choice in event.chunk.choices:
+                            finish_reason = choice.finish_reason or finish_reason
+                    # The first chunk only carries the role
+                    if event.type != "content.delta" or not event.delta:
+                        continue
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    content.append(event.delta)
+                    if max_tokens is not None and len(content) > max_tokens:
+                        return aborted(f"exceeded token budget of {max_tokens}")
+                    if guard is not None and len(content) % check_interval == 0:
+                        reason = guard.check("".join(content))
+                        if reason:
+                            return aborted(reason)
+
+        except openai.LengthFinishReasonError:
+            return aborted(f"exceeded token budget of {max_tokens}")
+        except openai.ContentFilterFinishReasonError:
+            return aborted("stopped by the content filter")
+        except (ValueError, pydantic.ValidationError) as e:
+            # The SDK parses partial JSON for pydantic formats itself and fails
+            # before SchemaGuard sees the output
+            return aborted(f"invalid output: {e}")
+        except Exception as e:
+            return {"error": f"{e}"}, False
+
+        # The SDK only raises the finish-reason errors for pydantic formats
+        if finish_reason == "length":
+            return aborted(f"exceeded token budget of {max_tokens}")
+        if finish_reason == "content_filter":
+            return aborted("stopped by the content filter")
+        if guard is not None:
+            reason = guard.check("".join(content), final=True)
+            if reason:
+                return aborted(reason)
+
+        return {
+            "content": "".join(content),
+            "ttft": ttft,
+            "latency": time.perf_counter() - start,
+            "num_tokens": len(content),
+            "usage": usage,
+        }, True
+
 def create_openai_client(local: bool = False) -> OpenAIClient:
     if local:
         base_url = os.getenv("LOCAL_OPENAI_BASE_URL", "http://localhost:8000/v1")
@@ -61,5 +162,7 @@ def create_openai_client(local: bool = False) -> OpenAIClient:
     return OpenAIClient(
         api_key=api_key,
         base_url=base_url,
-        model=model
+        model=model,
+        http_client=get_http_client(),
+        timeout=request_timeout()
     )
\ No newline at end of file
@@ -1,12 +1,56 @@
 import json
 import time
+import hashlib
+import statistics
 import pyarrow as pa
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from tqdm import tqdm
 
 from .evaluator import StructuredEvaluator, judge
-from .openai_client import OpenAIClient, create_openai_client
+from .openai_client import OpenAIClient, create_openai_client, usage_of
 from .data_loader import load_benchmark_data, FLAT_TRANSFORMS
+from .streaming import json_schema_of, token_budget
+
+
+def summarize_latency(values: List[float]) -> Dict[str, float]:
+    if len(values) == 0:
+        return {}
+    values = sorted(values)
+    return {
+        "mean": statistics.fmean(values),
+        "p50": values[int(0.50 * (len(values) - 1))],
+        "p95": values[int(0.95 * (len(values) - 1))],
+    }
+
+
+def summarize_prefix_cache(usages: List[Dict[str, int]]) -> Dict[str, Any]:
+    if len(usages) == 0:
+        return {}
+    prompt_tokens = sum(usage["prompt_tokens"] for usage in usages)
+    cached_tokens = sum(usage["cached_tokens"] for usage in usages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "prefill_tokens_saved": cached_tokens,
+        "hit_ratio": cached_tokens / prompt_tokens if prompt_tokens > 0 else 0.0,
+    }
+
+def score_judgement(judgement: List[pa.Table]) -> Tuple[float, List[Dict[str, Any]]]:
+    if len(judgement) == 0:
+        return 0.0, []
+    overall_accuracy = sum(list(map(lambda x: all(x.column("is_correct")), judgement))) / len(judgement)
+    judgement = pa.concat_tables(judgement)
+    field_stats = judgement.group_by(["key"]).aggregate([("is_correct", "mean")]).rename_columns(["field", "accuracy"]).to_pylist()
+    return overall_accuracy, field_stats
+
+def rescore_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    flat_transform = FLAT_TRANSFORMS.get(results["benchmark_name"])
+    judgement = [
+        judge(true_dict=record["ground_truth"], fit_dict=record["prediction"], flat_transform=flat_transform)
+        for record in results.get("records", [])
+    ]
+    overall_accuracy, field_stats = score_judgement(judgement)
+    return {**results, "overall_accuracy": overall_accuracy, "statistics": field_stats}
 
 
 class BenchmarkRunner:
@@ -29,7 +73,10 @@ class BenchmarkRunner:
                       system_prompt: Optional[str] = None,
                       model: Optional[str] = None,
                       temperature: float = 0.0,
-                      max_workers: int = 5
+                      max_workers: int = 5,
+                      stream: bool = False,
+                      warmup: int = 0,
+                      prefix_cache: bool = False
                       ) -> Dict[str, Any]:
         print(f"Start {self.benchmark_name} benchmark")
         
@@ -41,10 +88,49 @@ class BenchmarkRunner:
         )
         
         print(f"load {len(tasks)} samples")
+        return self.evaluate(
+            tasks=tasks,
+            ground_truths=ground_truths,
+            system_prompt=system_prompt,
+            model=model,
+            temperature=temperature,
+            max_workers=max_workers,
+            stream=stream,
+            warmup=warmup,
+            prefix_cache=prefix_cache
+        )
 
-        judgement = []
-        error_logs = []
-        for task, ground_truth in tqdm(zip(tasks, ground_truths), desc="send task"):
+    def prefix_fingerprint(self, system_prompt: str) -> str:
+        """Hash of the fixed request prefix: system prompt followed by the response schema."""
+        schema = json.dumps(json_schema_of(self.schema), sort_keys=True)
+        return hashlib.sha256(f"{system_prompt}\0{schema}".encode("utf-8")).hexdigest()[:16]
+
+    def parse_streamed_content(self, content: str) -> Dict[str, Any]:
+        if isinstance(self.schema, dict):
+            return json.loads(content)
+        return self.schema.model_validate_json(content).model_dump()
+
+    def request(self,
+                task: str,
+                system_prompt: str,
+                model: Optional[str] = None,
+                temperature: float = 0.0,
+                stream: bool = False,
+                max_tokens: Optional[int] = None,
+                json_schema: Optional[Dict[str, Any]] = None
+                ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        if stream:
+            response, status = self.openai_client.get_streaming_response(
+                task=task,
+                system_prompt=system_prompt,
+                response_format=self.schema,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                json_schema=json_schema
+            )
+        else:
             response, status = self.openai_client.get_structured_response(
                 task=task,
                 system_prompt=system_prompt,
@@ -52,34 +138,118 @@ class BenchmarkRunner:
                 model=model,
                 temperature=temperature
             )
-            if status:
-                if response.choices[0].message.parsed:
-                    fit = response.choices[0].message.parsed.model_dump()
-                else:
-                    fit = json.loads(response.choices[0].message.content)
+        outcome = {"latency": time.perf_counter() - start, "ttft": response.get("ttft") if stream else None}
+        if not status:
+            outcome.update(status="aborted" if response.get("aborted") else "error", log=response)
+            return outcome
+        outcome["usage"] = response.get("usage") if stream else usage_of(response.usage)
+        try:
+            if stream:
+                fit = self.parse_streamed_content(response["content"])
+            elif response.choices[0].message.parsed:
+                fit = response.choices[0].message.parsed.model_dump()
+            else:
+                fit = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            outcome.update(status="error", log={"error": f"{e}"})
+            return outcome
+        outcome.update(status="success", fit=fit)
+        return outcome
+
+    def summarize(self,
+                  outcomes: List[Dict[str, Any]],
+                  ground_truths: List[Dict[str, Any]],
+                  model: Optional[str] = None,
+                  max_tokens: Optional[int] = None
+                  ) -> Dict[str, Any]:
+        flat_transform = FLAT_TRANSFORMS.get(self.benchmark_name)
+        judgement = []
+        records = []
+        error_logs = []
+        aborted_logs = []
+        for outcome, ground_truth in zip(outcomes, ground_truths):
+            if outcome["status"] == "success":
                 judgement.append(judge(
                     true_dict=ground_truth,
-                    fit_dict=fit,
-                    flat_transform=FLAT_TRANSFORMS.get(self.benchmark_name))
+                    fit_dict=outcome["fit"],
+                    flat_transform=flat_transform)
                     )
+                records.append({"ground_truth": ground_truth, "prediction": outcome["fit"]})
+            elif outcome["status"] == "aborted":
+                aborted_logs.append(outcome["log"])
             else:
-                error_logs.append(response)
-            del response, status
+                error_logs.append(outcome["log"])
 
-        overall_accuracy = sum(list(map(lambda x: all(x.column("is_correct")), judgement))) / len(judgement)
-        judgement = pa.concat_tables(judgement)
-        field_stats = judgement.group_by(["key"]).aggregate([("is_correct", "mean")]).rename_columns(["field", "accuracy"]).to_pylist()
+        overall_accuracy, field_stats = score_judgement(judgement)
 
         final_results = {
             "benchmark_name": self.benchmark_name,
             "model": model or self.openai_client.model,
-            "sample_size": len(tasks),
-            "success_number": len(tasks) - len(error_logs),
+            "sample_size": len(outcomes),
+            "success_number": len(outcomes) - len(error_logs) - len(aborted_logs),
+            "error_number": len(error_logs),
+            "aborted_number": len(aborted_logs),
             "overall_accuracy": overall_accuracy,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "statistics": field_stats,
+            "latency": summarize_latency([outcome["latency"] for outcome in outcomes]),
+            "records": records,
         }
-        print(f"Overall accuracy: {overall_accuracy:.2%}")
+        usages = [outcome["usage"] for outcome in outcomes if outcome.get("usage")]
+        if len(usages) > 0:
+            final_results["prefix_cache"] = summarize_prefix_cache(usages)
+        ttfts = [outcome["ttft"] for outcome in outcomes if outcome.get("ttft") is not None]
+        if max_tokens is not None or len(ttfts) > 0:
+            final_results["token_budget"] = max_tokens
+            final_results["ttft"] = summarize_latency(ttfts)
+        return final_results
+
+    def warmup(self,
+               tasks: List[str],
+               system_prompt: str,
+               num_requests: int = 1,
+               **kwargs) -> List[Dict[str, Any]]:
+        """Send throwaway requests to open connections before the measured fan-out."""
+        return [self.request(task=tasks[i % len(tasks)], system_prompt=system_prompt, **kwargs)
+                for i in range(num_requests if len(tasks) > 0 else 0)]
+
+    def evaluate(self,
+                 tasks: List[str],
+                 ground_truths: List[Dict[str, Any]],
+                 system_prompt: str,
+                 model: Optional[str] = None,
+                 temperature: float = 0.0,
+                 max_workers: int = 5,
+                 stream: bool = False,
+                 warmup: int = 0,
+                 prefix_cache: bool = False
+                 ) -> Dict[str, Any]:
+        if prefix_cache:
+            # Fill the server's KV cache with the shared prefix before fanning out
+            warmup = max(warmup, 1)
+        request_kwargs = {
+            "system_prompt": system_prompt,
+            "model": model,
+            "temperature": temperature,
+            "stream": stream,
+            "max_tokens": token_budget(ground_truths) if stream else None,
+            "json_schema": json_schema_of(self.schema) if stream else None,
+        }
+        # Warm-up outcomes are dropped so they never reach the latency statistics
+        self.warmup(tasks, num_requests=warmup, **request_kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(tqdm(
+                pool.map(lambda task: self.request(task=task, **request_kwargs), tasks),
+                total=len(tasks),
+                desc="send task"
+            ))
+
+        final_results = self.summarize(outcomes, ground_truths, model=model, max_tokens=request_kwargs["max_tokens"])
+        final_results["warmup_requests"] = warmup
+        if prefix_cache:
+            final_results["prefix_fingerprint"] = self.prefix_fingerprint(system_prompt)
+        print(f"Overall accuracy: {final_results['overall_accuracy']:.2%}")
         return final_results
 
 def run_benchmark(benchmark_name: str,
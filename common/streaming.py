@@ -0,0 +1,119 @@
+import json
+from typing import Dict, Any, List, Optional
+
+from jiter import from_json
+
+
+def json_schema_of(schema: Any) -> Dict[str, Any]:
+    if isinstance(schema, dict):
+        return schema["json_schema"]["schema"]
+    return schema.model_json_schema()
+
+def token_budget(ground_truths: List[Dict[str, Any]],
+                 quantile: float = 0.99,
+                 factor: float = 2.0,
+                 chars_per_token: float = 3.0,
+                 minimum: int = 64) -> Optional[int]:
+    """Completion token limit derived from the serialized ground-truth sizes."""
+    sizes = sorted(len(json.dumps(item, default=str)) for item in ground_truths)
+    if len(sizes) == 0:
+        return None
+    size = sizes[min(len(sizes) - 1, int(quantile * len(sizes)))]
+    return max(minimum, int(size / chars_per_token * factor))
+
+
+def _matches_type(value: Any, type_name: str) -> bool:
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, list)
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "null":
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if type_name == "integer":
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if type_name == "number":
+        return isinstance(value, (int, float))
+    return True
+
+
+class SchemaGuard:
+    """Incremental check of a streamed JSON output against a JSON schema.
+
+    Only reports a violation once the partial output can no longer become a
+    valid instance: an unexpected key, a value of the wrong type or a string
+    that is not a prefix of any enum member. Invalid JSON is tolerated for
+    ``parse_error_slack`` characters, since partial literals may not parse yet.
+    """
+
+    def __init__(self, schema: Dict[str, Any], parse_error_slack: int = 32):
+        self.schema = schema
+        self.defs = schema.get("$defs", {})
+        self.parse_error_slack = parse_error_slack
+        self._error_at: Optional[int] = None
+
+    def check(self, text: str, final: bool = False) -> Optional[str]:
+        """Return why ``text`` can no longer match, or None; ``final`` marks the complete output."""
+        stripped = text.lstrip()
+        if not stripped:
+            return None
+        if not stripped.startswith("{"):
+            return "output is not a JSON object"
+        try:
+            value = from_json(stripped.encode("utf-8"), partial_mode="off" if final else "trailing-strings")
+        except ValueError as e:
+            if self._error_at is None:
+                self._error_at = len(stripped)
+            if final or len(stripped) - self._error_at > self.parse_error_slack:
+                return f"invalid JSON: {e}"
+            return None
+        self._error_at = None
+        return self._violation(value, self.schema, "$")
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        while "$ref" in schema:
+            schema = self.defs[schema["$ref"].split("/")[-1]]
+        return schema
+
+    def _violation(self, value: Any, schema: Dict[str, Any], path: str) -> Optional[str]:
+        schema = self._resolve(schema)
+        if "anyOf" in schema:
+            reasons = [self._violation(value, option, path) for option in schema["anyOf"]]
+            return None if any(reason is None for reason in reasons) else reasons[0]
+
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else types
+            if not any(_matches_type(value, type_name) for type_name in types):
+                return f"{path}: expected {'/'.join(types)}, got {type(value).__name__}"
+
+        if "enum" in schema and isinstance(value, str):
+            if not any(isinstance(option, str) and option.startswith(value) for option in schema["enum"]):
+                return f"{path}: '{value}' is not in {schema['enum']}"
+
+        if isinstance(value, dict):
+            properties = schema.get("properties", {})
+            additional = schema.get("additionalProperties", True)
+            for key, item in value.items():
+                if key in properties:
+                    reason = self._violation(item, properties[key], f"{path}.{key}")
+                elif additional is False:
+                    reason = f"{path}: unexpected key '{key}'"
+                elif isinstance(additional, dict):
+                    reason = self._violation(item, additional, f"{path}.{key}")
+                else:
+                    reason = None
+                if reason:
+                    return reason
+
+        if isinstance(value, list) and isinstance(schema.get("items"), dict):
+            for i, item in enumerate(value):
+                reason = self._violation(item, schema["items"], f"{path}[{i}]")
+                if reason:
+                    return reason
+        return None
@@ -0,0 +1,184 @@
+import itertools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from tqdm import tqdm
+
+from .schema import get_schema
+from .runner import BenchmarkRunner
+from .openai_client import OpenAIClient
+from .transport import get_http_client, request_timeout
+from .data_loader import load_benchmark_data
+from .streaming import json_schema_of, token_budget
+
+
+def build_configs(models: List[str],
+                  endpoints: Dict[str, Any],
+                  temperatures: List[float],
+                  prompt_variants: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+    """Cartesian product of the sweep axes.
+
+    Only the names of ``endpoints`` are used. ``prompt_variants`` maps a name to
+    a system prompt, where ``None`` keeps the benchmark default and ``{default}``
+    inside a prompt is replaced by it.
+    """
+    return [
+        {
+            "model": model,
+            "endpoint": endpoint,
+            "temperature": temperature,
+            "prompt_variant": variant,
+        }
+        for model, endpoint, temperature, variant in itertools.product(
+            models, endpoints, temperatures, prompt_variants)
+    ]
+
+def resolve_prompt(variant: Optional[str], default_prompt: str) -> str:
+    if variant is None:
+        return default_prompt
+    return variant.replace("{default}", default_prompt)
+
+def _prefix_groups(configs: List[Dict[str, Any]]) -> Dict[str, List[List[int]]]:
+    # Configs on one endpoint sharing a model and prompt share the cached prefix;
+    # temperature only affects decoding
+    groups = {}
+    for c, config in enumerate(configs):
+        endpoint_groups = groups.setdefault(config["endpoint"], {})
+        endpoint_groups.setdefault((config["model"], config["prompt_variant"]), []).append(c)
+    return {endpoint: list(endpoint_groups.values()) for endpoint, endpoint_groups in groups.items()}
+
+def sweep_tasks(pool: Executor,
+                benchmark_name: str,
+                tasks: List[str],
+                ground_truths: List[Dict[str, Any]],
+                default_prompt: str,
+                configs: List[Dict[str, Any]],
+                clients: Dict[str, OpenAIClient],
+                prompt_variants: Dict[str, Optional[str]],
+                stream: bool = False,
+                warmup: int = 0,
+                prefix_cache: bool = False) -> List[Dict[str, Any]]:
+    schema = get_schema(benchmark_name)
+    runners = {name: BenchmarkRunner(benchmark_name, schema, openai_client=client)
+               for name, client in clients.items()}
+    prompts = {name: resolve_prompt(variant, default_prompt) for name, variant in prompt_variants.items()}
+    json_schema = json_schema_of(schema) if stream else None
+    max_tokens = token_budget(ground_truths) if stream else None
+    if prefix_cache:
+        warmup = max(warmup, 1)
+
+    def request_kwargs(config: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "system_prompt": prompts[config["prompt_variant"]],
+            "model": config["model"],
+            "temperature": config["temperature"],
+            "stream": stream,
+            "max_tokens": max_tokens,
+            "json_schema": json_schema,
+        }
+
+    outcomes = [None] * len(configs)
+    progress = tqdm(total=len(tasks) * len(configs), desc="send task")
+
+    def collect(c: int, futures: List[Any]) -> None:
+        outcomes[c] = []
+        for future in futures:
+            outcomes[c].append(future.result())
+            progress.update(1)
+
+    if prefix_cache:
+        # Each endpoint works through one prefix group at a time: warm up, then fan
+        # out, so requests with different prefixes never compete for its KV cache.
+        # Endpoints still run side by side within the shared pool.
+        def drive(endpoint: str, groups: List[List[int]]) -> None:
+            runner = runners[endpoint]
+            for group in groups:
+                # Through the pool too, so drivers never add requests beyond max_workers
+                pool.submit(runner.warmup, tasks, num_requests=warmup, **request_kwargs(configs[group[0]])).result()
+                futures = {c: [pool.submit(runner.request, task=task, **request_kwargs(configs[c])) for task in tasks]
+                           for c in group}
+                for c, config_futures in futures.items():
+                    collect(c, config_futures)
+
+        groups = _prefix_groups(configs)
+        with ThreadPoolExecutor(max_workers=len(groups)) as drivers:
+            for future in [drivers.submit(drive, endpoint, endpoint_groups)
+                           for endpoint, endpoint_groups in groups.items()]:
+                future.result()
+    else:
+        # One warm-up per (endpoint, model) before the fan-out, excluded from the results
+        warmups = {}
+        for config in configs:
+            warmups.setdefault((config["endpoint"], config["model"]), config)
+        for future in [pool.submit(runners[config["endpoint"]].warmup, tasks, num_requests=warmup,
+                                   **request_kwargs(config))
+                       for config in warmups.values()]:
+            future.result()
+
+        # Submit sample-major so every config progresses at the same pace; all
+        # requests reference the same task strings instead of per-config copies
+        futures = [[None] * len(tasks) for _ in configs]
+        for i, task in enumerate(tasks):
+            for c, config in enumerate(configs):
+                futures[c][i] = pool.submit(runners[config["endpoint"]].request, task=task, **request_kwargs(config))
+        for c, config_futures in enumerate(futures):
+            collect(c, config_futures)
+    progress.close()
+
+    results = []
+    for config, config_outcomes in zip(configs, outcomes):
+        runner = runners[config["endpoint"]]
+        result = runner.summarize(config_outcomes, ground_truths, model=config["model"], max_tokens=max_tokens)
+        result.update(config, warmup_requests=warmup)
+        if prefix_cache:
+            result["prefix_fingerprint"] = runner.prefix_fingerprint(prompts[config["prompt_variant"]])
+        results.append(result)
+    return results
+
+def run_sweep(benchmarks: List[str],
+              configs: List[Dict[str, Any]],
+              endpoints: Dict[str, Tuple[Optional[str], Optional[str]]],
+              prompt_variants: Dict[str, Optional[str]],
+              sample_size: Optional[int] = None,
+              max_workers: int = 5,
+              stream: bool = False,
+              warmup: int = 0,
+              prefix_cache: bool = False) -> List[Dict[str, Any]]:
+    # Every endpoint client shares the process-wide keep-alive pool
+    clients = {
+        name: OpenAIClient(api_key=api_key, base_url=base_url, model=configs[0]["model"],
+                           http_client=get_http_client(), timeout=request_timeout())
+        for name, (base_url, api_key) in endpoints.items()
+    }
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for benchmark_name in benchmarks:
+            print(f"Start {benchmark_name} sweep over {len(configs)} configs")
+            tasks, ground_truths, _, default_prompt = load_benchmark_data(benchmark_name, sample_size=sample_size)
+            print(f"load {len(tasks)} samples")
+            results.extend(sweep_tasks(
+                pool, benchmark_name, tasks, ground_truths, default_prompt,
+                configs, clients, prompt_variants, stream=stream, warmup=warmup, prefix_cache=prefix_cache
+            ))
+            del tasks, ground_truths
+    return results
+
+def comparison_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "benchmark": result["benchmark_name"],
+            "model": result["model"],
+            "endpoint": result["endpoint"],
+            "temperature": result["temperature"],
+            "prompt": result["prompt_variant"],
+            "accuracy": result["overall_accuracy"],
+            "success": result["success_number"],
+            "errors": result["error_number"],
+            "aborted": result["aborted_number"],
+            "latency_mean": result["latency"].get("mean"),
+            "latency_p50": result["latency"].get("p50"),
+            "latency_p95": result["latency"].get("p95"),
+            "cache_hit_ratio": result.get("prefix_cache", {}).get("hit_ratio"),
+            "prefill_saved": result.get("prefix_cache", {}).get("prefill_tokens_saved"),
+        }
+        for result in results
+    ]
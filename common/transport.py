@@ -0,0 +1,83 @@
+import os
+import threading
+import importlib
+from typing import Any, Dict, Optional
+
+import openai
+
+
+# The HTTP package openai's client is built on: httpx, or httpx2 in newer releases.
+# Timeout and Limits must come from the same package as the client.
+_http = importlib.import_module(openai.DefaultHttpxClient.__mro__[1].__module__.split(".")[0])
+
+_lock = threading.Lock()
+_settings: Optional[Dict[str, Any]] = None
+_clients: Dict[tuple, Any] = {}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+def default_settings() -> Dict[str, Any]:
+    max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS") or os.getenv("MAX_WORKERS") or 5)
+    return {
+        "max_connections": max_connections,
+        "max_keepalive_connections": int(os.getenv("HTTP_MAX_KEEPALIVE") or max_connections),
+        "keepalive_expiry": _env_float("HTTP_KEEPALIVE_EXPIRY", 30.0),
+        "http2": os.getenv("HTTP2", "false").lower() in ("1", "true", "yes"),
+        "connect_timeout": _env_float("HTTP_CONNECT_TIMEOUT", 5.0),
+        "read_timeout": _env_float("HTTP_READ_TIMEOUT", 600.0),
+    }
+
+def configure_transport(**overrides: Any) -> Dict[str, Any]:
+    """Set the process-wide transport settings; ``None`` values keep the env defaults.
+
+    ``max_connections`` should match the number of concurrent requests so the
+    pool neither blocks workers nor keeps idle sockets around.
+    """
+    global _settings
+    settings = default_settings()
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    if overrides.get("max_keepalive_connections") is None and not os.getenv("HTTP_MAX_KEEPALIVE"):
+        settings["max_keepalive_connections"] = settings["max_connections"]
+    with _lock:
+        _settings = settings
+    return settings
+
+def transport_settings() -> Dict[str, Any]:
+    with _lock:
+        if _settings is not None:
+            return dict(_settings)
+    return configure_transport()
+
+def request_timeout(settings: Optional[Dict[str, Any]] = None) -> Any:
+    settings = settings or transport_settings()
+    return _http.Timeout(settings["read_timeout"], connect=settings["connect_timeout"])
+
+def create_http_client(settings: Dict[str, Any]) -> Any:
+    # http2=True needs the optional `h2` package (pip install httpx[http2])
+    return openai.DefaultHttpxClient(
+        limits=_http.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        timeout=request_timeout(settings),
+        http2=settings["http2"],
+    )
+
+def get_http_client(settings: Optional[Dict[str, Any]] = None) -> Any:
+    """Keep-alive client shared by every OpenAIClient built with the same settings."""
+    settings = settings or transport_settings()
+    key = tuple(sorted(settings.items()))
+    with _lock:
+        if key not in _clients:
+            _clients[key] = create_http_client(settings)
+        return _clients[key]
+
+def close_transport() -> None:
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()